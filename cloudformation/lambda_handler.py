@@ -3,50 +3,135 @@ import json
 import boto3
 import base64
 import urllib.parse
-import urllib.request
+import urllib3
 import datetime
-from boto3.dynamodb.conditions import Key
+import time
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from botocore.config import Config
+from boto3.dynamodb.types import TypeDeserializer
 from aws_lambda_powertools import Logger, Metrics, Tracer
 
+try:
+    # orjson is much faster than the stdlib on large Jira payloads; it is not part
+    # of the Lambda runtime, so it is only used when attached as a layer
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = Logger()
 metrics = Metrics()
 tracer = Tracer()
 
 region = os.environ["AWS_REGION"]
-dynamodb = boto3.resource("dynamodb")
+# Keep connections alive and pooled so warm invocations skip the TLS handshake
+boto_config = Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+)
+dynamodb = boto3.client("dynamodb", region_name=region, config=boto_config)
+deserializer = TypeDeserializer()
+secrets_manager = boto3.client("secretsmanager", region_name=region, config=boto_config)
+# Pooled HTTP client so Jira calls reuse connections across warm invocations.
+# Bound connect/read time and skip read retries so a hung Jira cannot run the
+# function into its own timeout.
+JIRA_TIMEOUT = urllib3.Timeout(connect=3.0, read=10.0)
+JIRA_MAX_CONCURRENCY = 5
+jira_http = urllib3.PoolManager(
+    maxsize=JIRA_MAX_CONCURRENCY,
+    timeout=JIRA_TIMEOUT,
+    retries=urllib3.Retry(connect=1, read=0),
+)
+
+# Secret name -> (expires_at, value), shared across warm invocations
+_SECRET_CACHE: dict[str, tuple[float, str]] = {}
+# (customer_id, projection) -> (expires_at, item). Short-lived so repeated agent
+# calls for the same customer skip DynamoDB; invalidate here if writes are added.
+_CUSTOMER_CACHE: dict[tuple, tuple[float, dict]] = {}
+CUSTOMER_CACHE_TTL = 30
+CUSTOMER_CACHE_MAXSIZE = 512
+
+
+def json_loads(data):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def json_dumps(obj):
+    return orjson.dumps(obj).decode("utf-8") if orjson else json.dumps(obj)
+
+
+@functools.lru_cache(maxsize=4)
+def _build_basic_auth(username, api_key):
+    """Return the Basic Authorization header value, memoized per credential pair"""
+    credentials = base64.b64encode(f"{username}:{api_key}".encode("utf-8")).decode("utf-8")
+    return f"Basic {credentials}"
+
 
 customer_table_name = "CUSTOMER_TABLE"
 interaction_table_name = "INTERACTION_TABLE"
 
 
 class CustomerService:
+    # Projections for the fixed lookups, so they skip building the expression per call
+    _OVERVIEW_PROJ = "overview"
+    _PREFS_PROJ = "meetingType,timeofDay,dayOfWeek"
+
     def __init__(self, customer_table_name, interaction_table_name):
-        self.customer_table = dynamodb.Table(customer_table_name)
-        self.interactions_table = dynamodb.Table(interaction_table_name)
+        self.customer_table_name = customer_table_name
+        self.interactions_table_name = interaction_table_name
+
+    @staticmethod
+    def _deserialize(item):
+        return {key: deserializer.deserialize(value) for key, value in item.items()}
 
     @tracer.capture_method
     def get_recent_customer_interactions(self, customer_id, count):
         try:
-            response = self.interactions_table.query(
+            response = dynamodb.query(
+                TableName=self.interactions_table_name,
+                # Read-only lookups tolerate eventual consistency, which is half
+                # the read cost and lower latency than strongly consistent reads
+                ConsistentRead=False,
                 ScanIndexForward=False,
                 Limit=count,
-                KeyConditionExpression=Key("customer_id").eq(customer_id),
+                KeyConditionExpression="customer_id = :customer_id",
+                ExpressionAttributeValues={":customer_id": {"S": customer_id}},
                 ProjectionExpression="#interaction_date,notes",
                 ExpressionAttributeNames={"#interaction_date": "date"},
             )
-            return response["Items"]
+            return [self._deserialize(item) for item in response["Items"]]
         except Exception as e:
             logger.error(f"Error getting recent customer interactions: {str(e)}")
             raise
 
     @tracer.capture_method
     def get_customer_details(self, customer_id, *args):
+        return self._get_item(customer_id, ",".join(map(str, args)))
+
+    @tracer.capture_method
+    def _get_item(self, customer_id, projection):
+        cache_key = (customer_id, projection)
+        cached = _CUSTOMER_CACHE.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
         try:
-            response = self.customer_table.get_item(
-                Key={"customer_id": customer_id},
-                ProjectionExpression=",".join(map(str, args)),
+            response = dynamodb.get_item(
+                TableName=self.customer_table_name,
+                Key={"customer_id": {"S": customer_id}},
+                ConsistentRead=False,
+                ProjectionExpression=projection,
             )
-            return response.get("Item", None)
+            item = response.get("Item", None)
+            item = self._deserialize(item) if item is not None else None
+            # Re-insert refreshed keys at the end so only real growth evicts
+            _CUSTOMER_CACHE.pop(cache_key, None)
+            if len(_CUSTOMER_CACHE) >= CUSTOMER_CACHE_MAXSIZE:
+                # Dicts keep insertion order, so this evicts the oldest entry
+                del _CUSTOMER_CACHE[next(iter(_CUSTOMER_CACHE))]
+            _CUSTOMER_CACHE[cache_key] = (time.monotonic() + CUSTOMER_CACHE_TTL, item)
+            return item
         except Exception as e:
             logger.error(f"Error getting customer details: {str(e)}")
             raise
@@ -54,7 +139,7 @@ class CustomerService:
     @tracer.capture_method
     def get_customer_overview(self, customer_id):
         try:
-            response = self.get_customer_details(customer_id, "overview")
+            response = self._get_item(customer_id, self._OVERVIEW_PROJ)
             if response:
                 return response["overview"]
             else:
@@ -66,74 +151,111 @@ class CustomerService:
     @tracer.capture_method
     def get_customer_preferences(self, customer_id):
         try:
-            response = self.get_customer_details(
-                customer_id, "meetingType", "timeofDay", "dayOfWeek"
-            )
+            response = self._get_item(customer_id, self._PREFS_PROJ)
             return response
         except Exception as e:
             logger.error(f"Error getting customer preferences: {str(e)}")
             raise
 
 
+class JiraTimeoutError(Exception):
+    """Raised when Jira does not respond within JIRA_TIMEOUT"""
+
+
+def _is_timeout(error):
+    # Exhausted retries wrap the underlying timeout in a MaxRetryError. urllib3
+    # derives NewConnectionError (refused connection, bad hostname) from
+    # ConnectTimeoutError, so exclude it to keep those as plain connection errors.
+    return any(
+        isinstance(e, urllib3.exceptions.TimeoutError)
+        and not isinstance(e, urllib3.exceptions.NewConnectionError)
+        for e in (error, getattr(error, "reason", None))
+    )
+
+
 class JiraInteraction:
     def __init__(self):
-        self.jira_url = get_secret('JIRA_URL')
-        self.jira_api_key_arn = get_secret('JIRA_API_KEY_ARN')
-        self.jira_username = get_secret('JIRA_USER_NAME')
-        self.credentials = base64.b64encode(
-            f"{self.jira_username}:{self.get_jira_api_key()}".encode("utf-8")
-        ).decode("utf-8")
+        # The three lookups are independent, so warm the secret cache concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            url_future = executor.submit(get_secret, 'JIRA_URL')
+            api_key_arn_future = executor.submit(get_secret, 'JIRA_API_KEY_ARN')
+            username_future = executor.submit(get_secret, 'JIRA_USER_NAME')
+        url_future.result()
+        api_key_arn_future.result()
+        username_future.result()
+        # Resolve the API key up front so a bad configuration fails initialization
+        self._auth_headers()
+
+    # The Jira settings are read through the secret cache on every use, so the
+    # get_secret TTL bounds how stale they get on a warm container
+    @property
+    def jira_url(self):
+        return get_secret('JIRA_URL')
+
+    @property
+    def jira_api_key_arn(self):
+        return get_secret('JIRA_API_KEY_ARN')
+
+    @property
+    def jira_username(self):
+        return get_secret('JIRA_USER_NAME')
+
+    def _auth_headers(self):
         # Set up the JIRA authentication header
-        self.headers = {
+        return {
             "Accept": "application/json",
             "Content-Type": "application/json",
-            "Authorization": f"Basic {self.credentials}",
+            "Authorization": _build_basic_auth(self.jira_username, self.get_jira_api_key()),
         }
 
     def get_jira_api_key(self):
         try:
-            secrets_manager = boto3.client("secretsmanager", region_name=region)
-            secret = secrets_manager.get_secret_value(SecretId=self.jira_api_key_arn)
-            return secret["SecretString"]
+            return get_secret(self.jira_api_key_arn)
         except Exception as e:
             logger.error(f"Error retrieving Jira API key: {str(e)}")
             raise
 
     @tracer.capture_method
     def get_open_jira_issues(self, project_id: str) -> list:
-        search_url = f"{self.jira_url}/search"
         query_params = urllib.parse.urlencode(
             {
-                "jql": f"project={project_id} AND issuetype=Task AND status='In Progress' OR status='To Do' order by duedate"
+                "jql": f"project={project_id} AND issuetype=Task AND status in (\"In Progress\", \"To Do\") ORDER BY duedate",
+                "fields": "summary,status,project,duedate,assignee",
+                "maxResults": "100",
             }
         )
-        full_url = f"{search_url}?{query_params}"
 
+        # Bound up front so the JSONDecodeError handler can always log it
+        response_data = ""
         try:
-            req = urllib.request.Request(full_url, headers=self.headers, method="GET")
-            with urllib.request.urlopen(req) as response:
-                response_data = response.read().decode("utf-8")
-                response_json = json.loads(response_data)
-                open_tasks = []
-                for issue in response_json["issues"]:
-                    task = {
-                        "issueKey": issue["key"],
-                        "summary": issue["fields"]["summary"],
-                        "status": issue["fields"]["status"]["name"],
-                        "project": issue["fields"]["project"]["name"],
-                        "duedate": issue["fields"]["duedate"],
-                        "assignee": (
-                            issue["fields"]["assignee"]["displayName"]
-                            if issue["fields"]["assignee"]
-                            else "None"
-                        ),
-                    }
-                    open_tasks.append(task)
-                return open_tasks
-        except urllib.error.HTTPError as e:
-            logger.info(f"Failed to get issues. HTTPError: {e.code} {e.reason}")
-        except urllib.error.URLError as e:
-            logger.info(f"Failed to get issues. URLError: {e.reason}")
+            search_url = f"{self.jira_url}/search"
+            full_url = f"{search_url}?{query_params}"
+            response = jira_http.request("GET", full_url, headers=self._auth_headers())
+            if response.status >= 400:
+                logger.info(f"Failed to get issues. HTTPError: {response.status} {response.reason}")
+                return []
+            response_data = response.data.decode("utf-8")
+            response_json = json_loads(response_data)
+            return [
+                {
+                    "issueKey": issue["key"],
+                    "summary": issue["fields"]["summary"],
+                    "status": issue["fields"]["status"]["name"],
+                    "project": issue["fields"]["project"]["name"],
+                    "duedate": issue["fields"]["duedate"],
+                    "assignee": (
+                        issue["fields"]["assignee"]["displayName"]
+                        if issue["fields"]["assignee"]
+                        else "None"
+                    ),
+                }
+                for issue in response_json["issues"]
+            ]
+        except urllib3.exceptions.HTTPError as e:
+            if _is_timeout(e):
+                logger.error(f"Timed out getting issues for project {project_id}")
+                raise JiraTimeoutError(f"Jira timed out listing issues for project {project_id}") from e
+            logger.info(f"Failed to get issues. Connection error: {str(e)}")
         except json.JSONDecodeError:
             logger.info(f"Failed to decode response as JSON: {response_data}")
         except Exception:
@@ -142,89 +264,147 @@ class JiraInteraction:
 
     @tracer.capture_method
     def update_jira_issue(self, issue_key: str, timeline_in_weeks: int) -> dict:
-        update_url = f"{self.jira_url}/issue/{issue_key}"
         due_date = (
             datetime.datetime.now() + datetime.timedelta(weeks=timeline_in_weeks)
         ).strftime("%Y-%m-%d")
-        update_payload = json.dumps({"fields": {"duedate": due_date}})
+        update_payload = json_dumps({"fields": {"duedate": due_date}})
 
         try:
-            update_req = urllib.request.Request(
-                update_url,
-                data=update_payload.encode(),
-                headers=self.headers,
-                method="PUT",
+            update_url = f"{self.jira_url}/issue/{issue_key}"
+            update_response = jira_http.request(
+                "PUT", update_url, body=update_payload.encode(), headers=self._auth_headers()
             )
-            with urllib.request.urlopen(update_req) as update_response:
-                update_data = update_response.read().decode("utf-8")
-                return {"issueKey": issue_key, "newTimeline": timeline_in_weeks}
-        except urllib.error.HTTPError as e:
-            logger.info(f"Failed to update task {issue_key}. HTTPError: {e.code} {e.reason}")
-        except urllib.error.URLError as e:
-            logger.info(f"Failed to update task {issue_key}. URLError: {e.reason}")
-        except json.JSONDecodeError:
-            logger.info(f"Failed to decode response for task {issue_key}: {update_data}")
+            if update_response.status >= 400:
+                logger.info(
+                    f"Failed to update task {issue_key}. HTTPError: {update_response.status} {update_response.reason}"
+                )
+                return {}
+            return {"issueKey": issue_key, "newTimeline": timeline_in_weeks}
+        except urllib3.exceptions.HTTPError as e:
+            if _is_timeout(e):
+                logger.error(f"Timed out updating task {issue_key}")
+                raise JiraTimeoutError(f"Jira timed out updating task {issue_key}") from e
+            logger.info(f"Failed to update task {issue_key}. Connection error: {str(e)}")
         except Exception:
             logger.info("Invalid Jira Configuration")
         return {}
 
+    @tracer.capture_method
+    def update_jira_issues(self, updates: list) -> list:
+        """Update several issues concurrently, returning one result per update in order"""
+
+        def _apply(update):
+            try:
+                return self.update_jira_issue(update["issueKey"], int(update["timelineInWeeks"]))
+            except JiraTimeoutError:
+                # A slow update should not discard the results of the others
+                return {}
+
+        if len(updates) <= 1:
+            return [_apply(update) for update in updates]
+        with ThreadPoolExecutor(max_workers=min(len(updates), JIRA_MAX_CONCURRENCY)) as executor:
+            return list(executor.map(_apply, updates))
+
+
+def get_secret(secret_name, ttl=300):
+    """Retrieve secret from AWS Secrets Manager, cached in memory for ttl seconds"""
+    cached = _SECRET_CACHE.get(secret_name)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
 
-def get_secret(secret_name):
-    """Retrieve secret from AWS Secrets Manager"""
-    session = boto3.session.Session()
-    client = session.client(
-        service_name='secretsmanager'
-    )
-    
     try:
-        get_secret_value_response = client.get_secret_value(
+        get_secret_value_response = secrets_manager.get_secret_value(
             SecretId=secret_name
         )
     except Exception as e:
         raise e
     else:
         if 'SecretString' in get_secret_value_response:
-            return get_secret_value_response['SecretString']
+            secret_value = get_secret_value_response['SecretString']
+            _SECRET_CACHE[secret_name] = (time.monotonic() + ttl, secret_value)
+            return secret_value
+
+
+class ServiceUnavailableError(Exception):
+    """Raised when the Jira client could not be initialized"""
+
+
+# Build the service clients once per container so warm invocations reuse them
+CUSTOMER_SERVICE = CustomerService(customer_table_name, interaction_table_name)
+
+# Only the Jira paths need the Jira secrets, so that client is built on first use
+_JIRA = None
+
+
+def _jira():
+    global _JIRA
+    if _JIRA is None:
+        try:
+            _JIRA = JiraInteraction()
+        except Exception as e:
+            logger.error(f"Error initializing Jira interaction: {str(e)}")
+            raise ServiceUnavailableError("Invalid Jira Configuration") from e
+    return _JIRA
+
+
+def _request_body(event):
+    return json_loads(event["body"]) if event.get("body") else {}
+
+
+# API path -> handler taking the query string parameters and the raw event.
+# Only the paths that need the request body parse it.
+_ROUTES = {
+    "/listRecentInteractions": lambda params, event: CUSTOMER_SERVICE.get_recent_customer_interactions(
+        params.get("customerId"), int(params.get("count"))
+    ),
+    "/getPreferences": lambda params, event: CUSTOMER_SERVICE.get_customer_preferences(
+        params.get("customerId")
+    ),
+    "/companyOverview": lambda params, event: CUSTOMER_SERVICE.get_customer_overview(
+        params.get("customerId")
+    ),
+    "/getOpenJiraIssues": lambda params, event: _jira().get_open_jira_issues(
+        params.get("projectId")
+    ),
+    "/updateJiraIssue": lambda params, event: _jira().update_jira_issue(
+        params.get("issueKey"), int(_request_body(event).get("timelineInWeeks"))
+    ),
+}
 
 
 @tracer.capture_lambda_handler
 def lambda_handler(event, _):
-    logger.info(event)
+    logger.debug(event)
 
     api_path = event["pathParameters"]['proxy']
-    customer_id = event["queryStringParameters"].get("customerId", None)
-    count = event["queryStringParameters"].get("count", None)
-    project_id = event["queryStringParameters"].get("projectId", None)
-    issue_key = event["queryStringParameters"].get("issueKey", None)
-
-    body_dict = {}
-    if "body" in event and event["body"]:
-        body_dict = json.loads(event["body"])
-    timeline_in_weeks = body_dict.get("timelineInWeeks", None)
+    query_params = event["queryStringParameters"]
 
     logger.info(
-        f"Request from API gateway with path: {api_path} project_id: {project_id} customer: {customer_id} count: {count} issue_key: {issue_key}"
+        "Request from API gateway",
+        extra={
+            "path": api_path,
+            "project_id": query_params.get("projectId", None),
+            "customer_id": query_params.get("customerId", None),
+            "count": query_params.get("count", None),
+            "issue_key": query_params.get("issueKey", None),
+        },
     )
 
-    customer_service = CustomerService(customer_table_name, interaction_table_name)
-    jira_interaction = JiraInteraction()
-
-    response_code = 200
-    if api_path == "/listRecentInteractions":
-        count = int(count)
-        result = customer_service.get_recent_customer_interactions(customer_id, count)
-    elif api_path == "/getPreferences":
-        result = customer_service.get_customer_preferences(customer_id)
-    elif api_path == "/companyOverview":
-        result = customer_service.get_customer_overview(customer_id)
-    elif api_path == "/getOpenJiraIssues":
-        result = jira_interaction.get_open_jira_issues(project_id)
-    elif api_path == "/updateJiraIssue":
-        result = jira_interaction.update_jira_issue(issue_key, int(timeline_in_weeks))
-    else:
+    route = _ROUTES.get(api_path)
+    if route is None:
         response_code = 404
         result = f"Unrecognized api path: {api_path}"
+    else:
+        try:
+            response_code = 200
+            result = route(query_params, event)
+        except ServiceUnavailableError as e:
+            response_code = 500
+            result = str(e)
+        except JiraTimeoutError as e:
+            response_code = 504
+            result = str(e)
 
-    response = {"statusCode": response_code, "body": json.dumps({"message": result})}
-    logger.info(response)
-    return response
\ No newline at end of file
+    response = {"statusCode": response_code, "body": json_dumps({"message": result})}
+    logger.debug(response)
+    return response